@@ -1,2 +1,17 @@
 from fci.fci import *
-from fci.utils import toDot, showCausalDifferences
+from fci.fci import __all__ as _FCI_ALL
+
+# fci.utils imports numpy, and graphviz on the first rendering call;
+# it is only loaded when one of its functions is requested.
+_LAZY_UTILS = ("toDot", "showCausalDifferences", "compareCausalGraphs")
+
+__all__ = _FCI_ALL + list(_LAZY_UTILS)
+
+def __getattr__(name: str):
+    if name in _LAZY_UTILS:
+        from fci import utils
+        return getattr(utils, name)
+    raise AttributeError(f"module 'fci' has no attribute '{name}'")
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_UTILS])
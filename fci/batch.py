@@ -0,0 +1,161 @@
+"""Run fci over many datasets on a pool of worker processes.
+
+    python -m fci.batch manifest.jsonl results.jsonl --workers 8 --timeout 600
+
+Each manifest line is a JSON object with a "data" CSV path (relative to the manifest)
+and optional "id", "alpha", "maxDepth", "test" ("chi2" or "G2") and "timeout" keys;
+missing keys take the command line defaults. Jobs are started largest file first and
+one JSON line is written per job as soon as it finishes.
+
+Each job runs in its own process so that the parent can kill it once it exceeds its
+time limit, even in the middle of a pyagrum call. Where processes are forked, pyagrum
+is imported once in the parent and inherited by every job.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import Connection, wait
+
+import networkx as nx
+
+from fci.fci import CI_TESTS, fci
+
+# Keys of a job copied into its result.
+RESULT_KEYS = ("id", "data", "alpha", "maxDepth", "test")
+
+def readManifest(path: str) -> list[dict]:
+    base = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    with open(path) as file:
+        for lineNumber, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            job = json.loads(line)
+            if "data" not in job:
+                raise Exception(f"The manifest line {lineNumber} has no 'data' key.")
+            job["data"] = os.path.join(base, job["data"])
+            job.setdefault("id", str(lineNumber))
+            jobs.append(job)
+    return jobs
+
+def pagToEdgeList(pag: nx.Graph) -> list[tuple[str, str, str, str]]:
+    """Return the edges of the PAG as (u, v, endpoint at u, endpoint at v)."""
+    return [(u, v, data[u].name, data[v].name) for u, v, data in pag.edges(data=True)]
+
+def runJob(job: dict, connection: Connection) -> None:
+    """Run fci on the job in a worker process and send back the result."""
+    import pyagrum as gum
+
+    try:
+        learner = gum.BNLearner(job["data"])
+        pag, log = fci(learner, alpha=job["alpha"], record=True, maxDepth=job["maxDepth"], test=job["test"])
+        result = { "status": "ok", "nodes": list(pag.nodes), "edges": pagToEdgeList(pag), "tests": len(log) }
+    except Exception as e:
+        result = { "status": "error", "error": f"{type(e).__name__}: {e}" }
+    connection.send(result)
+    connection.close()
+
+def jobSize(job: dict) -> int:
+    try:
+        return os.path.getsize(job["data"])
+    except OSError:
+        return 0
+
+def getContext():
+    # Forked jobs inherit the modules already imported by the parent.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+def runBatch(jobs: list[dict],
+             output: str,
+             workers: int | None=None,
+             alpha: float=0.05,
+             maxDepth: int | None=None,
+             test: str="chi2",
+             timeout: float | None=None) -> list[dict]:
+    """Run fci on every job and append one JSON line per finished job to output.
+    The keyword arguments are the defaults for the keys a job does not set."""
+    import pyagrum
+
+    defaults = { "alpha": alpha, "maxDepth": maxDepth, "test": test, "timeout": timeout }
+    jobs = [{ **defaults, **job } for job in jobs]
+    for job in jobs:
+        if job["test"] not in CI_TESTS:
+            raise Exception(f"Unknown independence test '{job['test']}', expected one of {CI_TESTS}.")
+    jobs.sort(key=jobSize, reverse=True)
+
+    context = getContext()
+    workers = workers or os.cpu_count() or 1
+    pending = deque(jobs)
+    # Connection of a running job -> (process, job, start time).
+    running = {}
+    results = []
+
+    with open(output, "a") as file:
+        def finish(connection: Connection, result: dict, elapsed: float) -> None:
+            process, job, _ = running.pop(connection)
+            process.join()
+            connection.close()
+
+            result = { **{ key: job[key] for key in RESULT_KEYS }, **result, "time": elapsed }
+            file.write(json.dumps(result) + "\n")
+            file.flush()
+            results.append(result)
+
+        while pending or running:
+            while pending and len(running) < workers:
+                job = pending.popleft()
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(target=runJob, args=(job, sender), daemon=True)
+                process.start()
+                sender.close()
+                running[receiver] = (process, job, time.perf_counter())
+
+            deadlines = [start + job["timeout"] for _, job, start in running.values() if job["timeout"]]
+            waitTime = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+            for connection in wait(list(running), timeout=waitTime):
+                process, job, start = running[connection]
+                try:
+                    result = connection.recv()
+                except EOFError:
+                    process.join()
+                    result = { "status": "error", "error": f"The worker exited with code {process.exitcode}." }
+                # A result that arrives after the deadline is not reported as ok.
+                elapsed = time.perf_counter() - start
+                if job["timeout"] and elapsed > job["timeout"]:
+                    result = { "status": "timeout" }
+                finish(connection, result, elapsed)
+
+            for connection, (process, job, start) in list(running.items()):
+                elapsed = time.perf_counter() - start
+                if job["timeout"] and elapsed > job["timeout"]:
+                    process.kill()
+                    finish(connection, { "status": "timeout" }, elapsed)
+    return results
+
+def main(argv: list[str] | None=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m fci.batch", description="Run fci over a manifest of datasets.")
+    parser.add_argument("manifest", help="JSON Lines manifest, one job per line")
+    parser.add_argument("output", help="JSON Lines file the results are appended to")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--max-depth", type=int, default=None, help="maximum conditioning set size")
+    parser.add_argument("--test", choices=CI_TESTS, default="chi2")
+    parser.add_argument("--timeout", type=float, default=None, help="time limit per job, in seconds")
+    args = parser.parse_args(argv)
+
+    runBatch(readManifest(args.manifest), args.output,
+             workers=args.workers,
+             alpha=args.alpha,
+             maxDepth=args.max_depth,
+             test=args.test,
+             timeout=args.timeout)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,29 @@
+from __future__ import annotations
+
 from itertools import combinations, permutations
 from collections import deque
-from typing import Generator
+from typing import Generator, TYPE_CHECKING
 
 import networkx as nx
-import pyagrum as gum
 
 from fci.endpoint import Endpoint
 
+# The learner is built by the caller; pyagrum is only needed for type hints.
+if TYPE_CHECKING:
+    import pyagrum as gum
+
+__all__ = [
+    "Endpoint",
+    "getTriplets", "hasEndpoint", "isCollider", "isTriangle", "isParent", "isSpouse", "isPDEdge",
+    "getPDSep", "reconstructPath", "getDiscriminatingPath", "getUncoveredCirclePath", "existUncoveredPDPath",
+    "getCITest", "initialSkeleton", "finalSkeleton",
+    "rule0", "rule1", "rule2", "rule3", "rule4", "rule5", "rule6", "rule7", "rule8", "rule9", "rule10",
+    "CI_TESTS", "fci"
+]
+
+# Independence tests of gum.BNLearner that fci can use.
+CI_TESTS = ("chi2", "G2")
+
 #=================== auxiliary functions ===================#
 def getTriplets(graph: nx.Graph) -> Generator[tuple[str, str, str], None, None]:
     """Return the permutation of all triplets in the graph."""
@@ -170,10 +187,19 @@ def existUncoveredPDPath(pag: nx.Graph, x: str, y: str, z: str) -> bool:
     return False
 
 #=================== skeleton discovery ===================#
+def getCITest(learner: gum.BNLearner, test: str):
+    """Return the learner's independence test method named test."""
+    if test not in CI_TESTS:
+        raise Exception(f"Unknown independence test '{test}', expected one of {CI_TESTS}.")
+    return getattr(learner, test)
+
 def initialSkeleton(learner: gum.BNLearner,
                     alpha: float=0.05,
                     record: bool=False,
-                    verbose: bool=False) -> tuple[nx.Graph, dict[tuple, set], list[tuple]]:
+                    verbose: bool=False,
+                    maxDepth: int | None=None,
+                    test: str="chi2") -> tuple[nx.Graph, dict[tuple, set], list[tuple]]:
+    ciTest = getCITest(learner, test)
     graph = nx.complete_graph(learner.names())
     sepsets = {}
     adjacents = { x: set(graph.neighbors(x)) for x in graph.nodes }
@@ -181,13 +207,13 @@ def initialSkeleton(learner: gum.BNLearner,
 
     log = []
     
-    while max(map(len, adjacents.values())) > d:
+    while max(map(len, adjacents.values())) > d and (maxDepth is None or d <= maxDepth):
         for x, y in graph.edges:
             if len(adjacents[x]) - 1 < d:
                 continue
 
             for Z in combinations(adjacents[x] - {y}, d):
-                _, pvalue = learner.chi2(x, y, Z)
+                _, pvalue = ciTest(x, y, Z)
 
                 if record:
                     log.append((x, y, Z, pvalue))
@@ -213,7 +239,10 @@ def finalSkeleton(learner: gum.BNLearner,
                   sepsets: dict[tuple, set],
                   alpha: float=0.05,
                   record: bool=False,
-                  verbose: bool=False) -> list[tuple]:
+                  verbose: bool=False,
+                  maxDepth: int | None=None,
+                  test: str="chi2") -> list[tuple]:
+    ciTest = getCITest(learner, test)
     pdseps = { x: getPDSep(pag, x) for x in pag.nodes }
 
     log = []
@@ -225,9 +254,9 @@ def finalSkeleton(learner: gum.BNLearner,
         d = 0
         pdsXMinusY = pdseps[x] - {y}
         done = False
-        while not done and len(pdsXMinusY) > d:
+        while not done and len(pdsXMinusY) > d and (maxDepth is None or d <= maxDepth):
             for Z in combinations(pdsXMinusY, d):
-                _, pvalue = learner.chi2(x, y, Z)
+                _, pvalue = ciTest(x, y, Z)
 
                 if record:
                     log.append((x, y, Z, pvalue))
@@ -565,13 +594,19 @@ def fci(learner: gum.BNLearner,
         alpha: float=0.05,
         record: bool=False,
         skeletonVerbose: bool=False,
-        ruleVerbose: bool=False) -> tuple[nx.Graph, list]:
-    
-    graph, sepsets, log = initialSkeleton(learner, alpha=alpha, record=record, verbose=skeletonVerbose)
+        ruleVerbose: bool=False,
+        maxDepth: int | None=None,
+        test: str="chi2") -> tuple[nx.Graph, list]:
+    """maxDepth caps the size of the conditioning sets (no cap if None);
+    test is the name of the learner's independence test, one of CI_TESTS;
+    it is checked by initialSkeleton before any test is run."""
+    graph, sepsets, log = initialSkeleton(learner, alpha=alpha, maxDepth=maxDepth, test=test,
+                                          record=record, verbose=skeletonVerbose)
     pag = rule0(graph, sepsets, verbose=ruleVerbose)
     if skeletonVerbose or ruleVerbose:
         print("\n\n")
-    log2 = finalSkeleton(learner, pag, sepsets, alpha=alpha, record=record, verbose=skeletonVerbose)
+    log2 = finalSkeleton(learner, pag, sepsets, alpha=alpha, maxDepth=maxDepth, test=test,
+                         record=record, verbose=skeletonVerbose)
     pag = rule0(pag, sepsets, verbose=ruleVerbose)
 
     hasChange = True
@@ -1,13 +1,21 @@
-import graphviz
-import networkx as nx
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
-import pyagrum as gum
+import networkx as nx
+import numpy as np
 
 from fci.endpoint import Endpoint
-from fci.fci import hasEndpoint
+
+# graphviz is imported on first rendering call; pyagrum is only needed for type hints.
+if TYPE_CHECKING:
+    import graphviz
+    import pyagrum as gum
 
 def toDot(pag: nx.Graph) -> graphviz.Digraph:
     """"""
+    import graphviz
+
     endpointToDotformat = {
         Endpoint.TAIL: "none",
         Endpoint.ARROWHEAD: "normal",
@@ -31,88 +39,145 @@ def toDot(pag: nx.Graph) -> graphviz.Digraph:
                  penwidth="1.5")
     return dot
 
-def showCausalDifferences(pag: nx.Graph, pdag: gum.PDAG, names: str) -> graphviz.Digraph:
+#=================== edge-mark matrices ===================#
+# marks[i, j] is the mark at j on the edge i *-* j, NO_EDGE if i and j are not adjacent.
+NO_EDGE = 0
+endpointToMark = {
+    Endpoint.TAIL: 1,
+    Endpoint.ARROWHEAD: 2,
+    Endpoint.CIRCLE: 3
+}
+TAIL_MARK = endpointToMark[Endpoint.TAIL]
+ARROWHEAD_MARK = endpointToMark[Endpoint.ARROWHEAD]
+
+def pagToMarks(pag: nx.Graph, names: list[str]) -> np.ndarray:
+    """Return the edge-mark matrix of the PAG, with nodes indexed as in names."""
     nameToID = { name: ID for ID, name in enumerate(names) }
-    edges = set()
-    arcs = set()
+    marks = np.full((len(names), len(names)), NO_EDGE, dtype=np.int8)
+
+    for u, v, data in pag.edges(data=True):
+        uID, vID = nameToID[u], nameToID[v]
+        marks[uID, vID] = endpointToMark[data[v]]
+        marks[vID, uID] = endpointToMark[data[u]]
+    return marks
+
+def pdagToMarks(pdag: gum.PDAG, size: int) -> np.ndarray:
+    """Return the edge-mark matrix of the PDAG, whose node ids are 0, ..., size - 1."""
+    marks = np.full((size, size), NO_EDGE, dtype=np.int8)
+
+    arcs = np.array(list(pdag.arcs()), dtype=np.intp).reshape(-1, 2)
+    marks[arcs[:, 0], arcs[:, 1]] = ARROWHEAD_MARK
+    marks[arcs[:, 1], arcs[:, 0]] = TAIL_MARK
+
+    edges = np.array(list(pdag.edges()), dtype=np.intp).reshape(-1, 2)
+    marks[edges[:, 0], edges[:, 1]] = TAIL_MARK
+    marks[edges[:, 1], edges[:, 0]] = TAIL_MARK
+    return marks
+
+def directedMask(marks: np.ndarray) -> np.ndarray:
+    # mask[i, j] is true if i -> j.
+    return (marks == ARROWHEAD_MARK) & (marks.T == TAIL_MARK)
+
+def bidirectedMask(marks: np.ndarray) -> np.ndarray:
+    # mask[i, j] is true if i <-> j.
+    return (marks == ARROWHEAD_MARK) & (marks.T == ARROWHEAD_MARK)
+
+def undirectedMask(marks: np.ndarray) -> np.ndarray:
+    # mask[i, j] is true if i *-* j is neither i -> j, i <- j nor i <-> j.
+    directed = directedMask(marks)
+    return (marks != NO_EDGE) & ~directed & ~directed.T & ~bidirectedMask(marks)
+
+def ratio(numerator: int, denominator: int) -> float:
+    return numerator / denominator if denominator else 0.0
+
+def compareCausalGraphs(pag: nx.Graph, pdag: gum.PDAG, names: list[str]) -> dict[str, int | float]:
+    """Return the structural differences between the PAG and the PDAG.
+
+    The SHD counts the pairs of nodes whose edges differ, comparing them as
+    showCausalDifferences does: i -> j, i <- j, i <-> j, no edge, or undirected
+    for any other edge, so a PAG circle matches a PDAG tail. Unlike the drawing,
+    it also counts the pairs where the PAG has i <-> j.
+    Adjacency counts are over unordered pairs, arrowhead counts over endpoints.
+    A precision or recall with an empty denominator is 0.
+    """
+    pagMarks = pagToMarks(pag, names)
+    pdagMarks = pdagToMarks(pdag, len(names))
+    pairs = np.triu(np.ones(pagMarks.shape, dtype=bool), k=1)
+
+    pagAdjacent = (pagMarks != NO_EDGE) & pairs
+    pdagAdjacent = (pdagMarks != NO_EDGE) & pairs
+    adjacencyTP = int(np.count_nonzero(pagAdjacent & pdagAdjacent))
+    adjacencyFP = int(np.count_nonzero(pagAdjacent & ~pdagAdjacent))
+    adjacencyFN = int(np.count_nonzero(~pagAdjacent & pdagAdjacent))
+    adjacencyTN = int(np.count_nonzero(pairs)) - adjacencyTP - adjacencyFP - adjacencyFN
+
+    pagArrowheads = pagMarks == ARROWHEAD_MARK
+    pdagArrowheads = pdagMarks == ARROWHEAD_MARK
+    arrowheadTP = int(np.count_nonzero(pagArrowheads & pdagArrowheads))
+    arrowheadFP = int(np.count_nonzero(pagArrowheads & ~pdagArrowheads))
+    arrowheadFN = int(np.count_nonzero(~pagArrowheads & pdagArrowheads))
+
+    different = (directedMask(pagMarks) != directedMask(pdagMarks)) | \
+                (undirectedMask(pagMarks) != undirectedMask(pdagMarks)) | \
+                (bidirectedMask(pagMarks) != bidirectedMask(pdagMarks)) | \
+                (pagAdjacent != pdagAdjacent)
+    shd = int(np.count_nonzero((different | different.T) & pairs))
+
+    return {
+        "shd": shd,
+        "adjacencyPrecision": ratio(adjacencyTP, adjacencyTP + adjacencyFP),
+        "adjacencyRecall": ratio(adjacencyTP, adjacencyTP + adjacencyFN),
+        "arrowheadPrecision": ratio(arrowheadTP, arrowheadTP + arrowheadFP),
+        "arrowheadRecall": ratio(arrowheadTP, arrowheadTP + arrowheadFN),
+        "adjacencyTP": adjacencyTP,
+        "adjacencyFP": adjacencyFP,
+        "adjacencyFN": adjacencyFN,
+        "adjacencyTN": adjacencyTN,
+        "arrowheadTP": arrowheadTP,
+        "arrowheadFP": arrowheadFP,
+        "arrowheadFN": arrowheadFN
+    }
+
+def showCausalDifferences(pag: nx.Graph,
+                          pdag: gum.PDAG,
+                          names: list[str],
+                          onlyDifferences: bool=False) -> graphviz.Digraph:
+    """Draw the PAG against the PDAG: green edges agree, dashed black edges are only in
+    the PAG and dashed red edges are only in the PDAG. Bidirected edges are not drawn.
+    If onlyDifferences is true, only the differing edges and their nodes are drawn."""
+    import graphviz
+
+    pagMarks = pagToMarks(pag, names)
+    pdagMarks = pdagToMarks(pdag, len(names))
+    pagArcs, pdagArcs = directedMask(pagMarks), directedMask(pdagMarks)
+    pagEdges, pdagEdges = np.triu(undirectedMask(pagMarks)), np.triu(undirectedMask(pdagMarks))
 
     dot = graphviz.Digraph(format="svg")
     dot.attr(rankdir="TB")
     dot.attr("node", style="filled", fillcolor="white", fontcolor="black")
-    
-    # Draw causal graph.
-    for node in pag.nodes:
-        dot.node(node)
-    
-    for u, v in pag.edges:
-        if hasEndpoint(pag, u, v, Endpoint.ARROWHEAD, Endpoint.ARROWHEAD):
-            continue
-        
-        uID, vID = nameToID[u], nameToID[v]
-        if hasEndpoint(pag, u, v, Endpoint.TAIL, Endpoint.ARROWHEAD):
-            arcs.add((uID, vID))
-            if pdag.existsArc(uID, vID):
-                color = "green"
-                style = "solid"
-            else:
-                color = "black"
-                style = "dashed"
-            dot.edge( u, v,
-                     arrowtail="none",
-                     arrowhead="normal",
-                     dir="both",
-                     penwidth="1.5",
-                     color=color,
-                     style=style)
-        elif hasEndpoint(pag, v, u, Endpoint.TAIL, Endpoint.ARROWHEAD):
-            arcs.add((vID, uID))
-            if pdag.existsArc(vID, uID):
-                color = "green"
-                style = "solid"
-            else:
-                color = "black"
-                style = "dashed"
-            dot.edge(v, u,
-                     arrowtail="none",
-                     arrowhead="normal",
-                     dir="both",
-                     penwidth="1.5",
-                     color=color,
-                     style=style)
-        else:
-            edges.add((uID, vID))
-            edges.add((vID, uID))
-            if pdag.existsEdge(uID, vID):
-                color = "green"
-                style = "solid"
-            else:
-                color = "black"
-                style = "dashed"
-            dot.edge(u, v,
+
+    if not onlyDifferences:
+        for node in pag.nodes:
+            dot.node(node)
+
+    def drawEdges(mask: np.ndarray, arrowhead: str, color: str, style: str) -> None:
+        for uID, vID in zip(*np.nonzero(mask)):
+            dot.edge(names[uID], names[vID],
                      arrowtail="none",
-                     arrowhead="none",
+                     arrowhead=arrowhead,
                      dir="both",
                      penwidth="1.5",
                      color=color,
                      style=style)
-    
+
+    # Draw causal graph.
+    if not onlyDifferences:
+        drawEdges(pagArcs & pdagArcs, "normal", "green", "solid")
+        drawEdges(pagEdges & pdagEdges, "none", "green", "solid")
+    drawEdges(pagArcs & ~pdagArcs, "normal", "black", "dashed")
+    drawEdges(pagEdges & ~pdagEdges, "none", "black", "dashed")
+
     # Draw causal differences.
-    for u, v in pdag.edges():
-        if (u, v) not in edges:
-            dot.edge(names[u], names[v],
-                     arrowtail="none",
-                     arrowhead="none",
-                     dir="both",
-                     penwidth="1.5",
-                     color="red",
-                     style="dashed")
-    for u, v in pdag.arcs():
-        if (u, v) not in arcs:
-            dot.edge(names[u], names[v],
-                     arrowtail="none",
-                     arrowhead="normal",
-                     dir="both",
-                     penwidth="1.5",
-                     color="red",
-                     style="dashed")
+    drawEdges(pdagEdges & ~pagEdges, "none", "red", "dashed")
+    drawEdges(pdagArcs & ~pagArcs, "normal", "red", "dashed")
     return dot
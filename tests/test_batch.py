@@ -0,0 +1,69 @@
+import json
+import os
+
+import pyagrum as gum
+
+from fci.batch import main, readManifest, runBatch
+
+instancesDir = os.path.join(os.path.dirname(__file__), "instances")
+
+def writeDataset(directory, instance: str, size: int) -> str:
+    path = os.path.join(directory, f"{instance}.csv")
+    gum.generateSample(gum.loadBN(os.path.join(instancesDir, f"{instance}.bif")), size, path)
+    return path
+
+def writeManifest(directory) -> str:
+    writeDataset(directory, "asia", 2000)
+    writeDataset(directory, "bn-10n-10a-1", 2000)
+    writeDataset(directory, "bn-40n-40a-1", 5000)
+    jobs = [
+        { "id": "asia", "data": "asia.csv" },
+        { "id": "small", "data": "bn-10n-10a-1.csv", "test": "G2", "maxDepth": 0 },
+        { "id": "large", "data": "bn-40n-40a-1.csv", "timeout": 0.1 },
+        { "id": "missing", "data": "missing.csv" }
+    ]
+    path = os.path.join(directory, "manifest.jsonl")
+    with open(path, "w") as file:
+        file.writelines(json.dumps(job) + "\n" for job in jobs)
+    return path
+
+def testReadManifest(tmp_path):
+    jobs = readManifest(writeManifest(tmp_path))
+    assert [job["id"] for job in jobs] == ["asia", "small", "large", "missing"]
+    assert jobs[0]["data"] == os.path.join(tmp_path, "asia.csv")
+
+def testRunBatch(tmp_path):
+    jobs = readManifest(writeManifest(tmp_path))
+    output = os.path.join(tmp_path, "results.jsonl")
+    results = runBatch(jobs, output, workers=1, timeout=30)
+
+    with open(output) as file:
+        assert [json.loads(line) for line in file] == json.loads(json.dumps(results))
+
+    # With a single worker the results come back in scheduling order: largest file first.
+    sizes = { job["id"]: os.path.getsize(job["data"]) if os.path.exists(job["data"]) else 0 for job in jobs }
+    assert [result["id"] for result in results] == sorted(sizes, key=sizes.get, reverse=True)
+
+    results = { result["id"]: result for result in results }
+    assert results["large"]["status"] == "timeout"
+    assert results["missing"]["status"] == "error"
+    for ID in ("asia", "small"):
+        assert results[ID]["status"] == "ok"
+        assert results[ID]["tests"] > 0
+        for u, v, uEndpoint, vEndpoint in results[ID]["edges"]:
+            assert u in results[ID]["nodes"] and v in results[ID]["nodes"]
+            assert {uEndpoint, vEndpoint} <= {"TAIL", "ARROWHEAD", "CIRCLE"}
+
+    assert results["small"]["test"] == "G2" and results["small"]["maxDepth"] == 0
+    # Without conditioning sets, each pair is tested once by each skeleton phase at most.
+    assert results["small"]["tests"] <= 2 * 45
+    assert results["asia"]["test"] == "chi2" and results["asia"]["maxDepth"] is None
+
+def testMain(tmp_path):
+    output = os.path.join(tmp_path, "results.jsonl")
+    main([writeManifest(tmp_path), output, "--workers", "2", "--alpha", "0.01"])
+
+    with open(output) as file:
+        results = [json.loads(line) for line in file]
+    assert sorted(result["id"] for result in results) == ["asia", "large", "missing", "small"]
+    assert all(result["alpha"] == 0.01 for result in results)
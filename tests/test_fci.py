@@ -0,0 +1,28 @@
+import os
+
+import pyagrum as gum
+import pytest
+
+from fci.fci import fci
+
+dataPath = os.path.join(os.path.dirname(__file__), "data", "asia-skeleton-test.csv")
+
+def testMaxDepth():
+    for maxDepth in (0, 1):
+        _, log = fci(gum.BNLearner(dataPath), record=True, maxDepth=maxDepth)
+        assert max(len(Z) for _, _, Z, _ in log) == maxDepth
+
+def testG2():
+    _, log = fci(gum.BNLearner(dataPath), record=True, test="G2")
+    learner = gum.BNLearner(dataPath)
+    x, y, Z, pvalue = log[0]
+    assert learner.G2(x, y, Z)[1] == pvalue
+
+def testPositionalRecord():
+    # fci(learner, alpha, record)
+    _, log = fci(gum.BNLearner(dataPath), 0.05, True)
+    assert max(len(Z) for _, _, Z, _ in log) > 1
+
+def testUnknownTest():
+    with pytest.raises(Exception, match="Unknown independence test 'names'"):
+        fci(gum.BNLearner(dataPath), test="names")
@@ -0,0 +1,92 @@
+import re
+
+import networkx as nx
+import pyagrum as gum
+
+from fci.endpoint import Endpoint
+from fci.utils import compareCausalGraphs, showCausalDifferences
+
+T, A, C = Endpoint.TAIL, Endpoint.ARROWHEAD, Endpoint.CIRCLE
+names = ["A", "B", "C", "D", "E", "F"]
+
+def buildGraphs() -> tuple[nx.Graph, gum.PDAG]:
+    # PAG:  A -> B, B o-o C, C -> D, D <-> E, A o-> E, B o-o F.
+    # PDAG: A -> B, B - C,   D -> C,          A - E,   E -> F.
+    pag = nx.Graph()
+    pag.add_nodes_from(names)
+    for u, v, uEndpoint, vEndpoint in [("A", "B", T, A), ("B", "C", C, C), ("C", "D", T, A),
+                                       ("D", "E", A, A), ("A", "E", C, A), ("B", "F", C, C)]:
+        pag.add_edge(u, v, **{ u: uEndpoint, v: vEndpoint })
+
+    pdag = gum.PDAG()
+    for _ in names:
+        pdag.addNode()
+    pdag.addArc(0, 1)
+    pdag.addEdge(1, 2)
+    pdag.addArc(3, 2)
+    pdag.addEdge(0, 4)
+    pdag.addArc(4, 5)
+    return pag, pdag
+
+def drawnEdges(dot) -> set[tuple[str, str, str, str]]:
+    edges = set()
+    for line in dot.body:
+        match = re.match(r"\s*(\S+) -> (\S+) \[(.*)\]", line)
+        if match:
+            u, v, attributes = match.groups()
+            attributes = dict(re.findall(r"(\w+)=(\S+)", attributes))
+            if attributes["arrowhead"] == "none":
+                u, v = sorted((u, v))
+            edges.add((u, v, attributes["arrowhead"], attributes["color"]))
+    return edges
+
+def testCompareCausalGraphs():
+    pag, pdag = buildGraphs()
+    assert compareCausalGraphs(pag, pdag, names) == {
+        # C -> D against D -> C, D <-> E, E -> F and B o-o F differ.
+        "shd": 4,
+        "adjacencyPrecision": 4 / 6,
+        "adjacencyRecall": 4 / 5,
+        "arrowheadPrecision": 1 / 5,
+        "arrowheadRecall": 1 / 3,
+        "adjacencyTP": 4,
+        "adjacencyFP": 2,
+        "adjacencyFN": 1,
+        "adjacencyTN": 8,
+        "arrowheadTP": 1,
+        "arrowheadFP": 4,
+        "arrowheadFN": 2
+    }
+
+def testCompareCausalGraphsCircleMatchesTail():
+    pag = nx.Graph()
+    pag.add_edge("A", "B", A=C, B=C)
+    pdag = gum.PDAG()
+    pdag.addNodes(2)
+    pdag.addEdge(0, 1)
+    assert compareCausalGraphs(pag, pdag, ["A", "B"])["shd"] == 0
+
+def testShowCausalDifferences():
+    # The edges drawn by the original per-edge implementation.
+    pag, pdag = buildGraphs()
+    assert drawnEdges(showCausalDifferences(pag, pdag, names)) == {
+        ("A", "B", "normal", "green"),
+        ("B", "C", "none", "green"),
+        ("A", "E", "none", "green"),
+        ("C", "D", "normal", "black"),
+        ("B", "F", "none", "black"),
+        ("D", "C", "normal", "red"),
+        ("E", "F", "normal", "red")
+    }
+
+def testShowCausalDifferencesOnlyDifferences():
+    pag, pdag = buildGraphs()
+    dot = showCausalDifferences(pag, pdag, names, onlyDifferences=True)
+    assert drawnEdges(dot) == {
+        ("C", "D", "normal", "black"),
+        ("B", "F", "none", "black"),
+        ("D", "C", "normal", "red"),
+        ("E", "F", "normal", "red")
+    }
+    # No node is drawn on its own, only the endpoints of the differing edges.
+    assert not any(line.strip() in names for line in dot.body)